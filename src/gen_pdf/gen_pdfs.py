@@ -9,7 +9,8 @@ from pathlib import Path
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4
 from datetime import datetime
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
 from tqdm import tqdm
 import argparse
 import random
@@ -111,23 +112,30 @@ def main():
     generated_total = load_progress(progress_file) if args.resume else 0
     logger.info(f"已生成 {generated_total} 个 PDF（续生成模式: {args.resume}）")
 
-    ranges = list(chunk_ranges(args.total, args.chunk_size))
+    ranges = [(max(s, generated_total), e) for s, e in chunk_ranges(args.total, args.chunk_size)
+              if e > generated_total]
     start_time = datetime.now()
-    futures = []
-
-    with ProcessPoolExecutor(max_workers=args.workers) as exe:
-        for s, e in ranges:
-            if e <= generated_total:
-                continue
-            s_adjusted = max(s, generated_total)
-            futures.append(exe.submit(worker_generate, s_adjusted, e, str(out_dir),
-                                       args.prefix, args.padding, args.files_per_dir,
-                                       args.min_pages, args.max_pages, args.fontsize))
-
-        for fut in tqdm(as_completed(futures), total=len(futures), desc="总体进度"):
-            gen, b = fut.result()
-            generated_total += gen
-            save_progress(progress_file, generated_total)
+
+    with ProcessPoolExecutor(max_workers=args.workers) as exe, tqdm(total=len(ranges), desc="总体进度") as bar:
+        def submit(s, e):
+            return exe.submit(worker_generate, s, e, str(out_dir),
+                              args.prefix, args.padding, args.files_per_dir,
+                              args.min_pages, args.max_pages, args.fontsize)
+
+        # 滑动窗口：最多 2 * workers 个任务在途，完成一个补一个，wait 只扫描在途集合
+        pending = iter(ranges)
+        inflight = {submit(s, e) for s, e in islice(pending, (args.workers or os.cpu_count() or 4) * 2)}
+        while inflight:
+            done, inflight = wait(inflight, return_when=FIRST_COMPLETED)
+            for fut in done:
+                gen, b = fut.result()
+                generated_total += gen
+                save_progress(progress_file, generated_total)
+                bar.update(1)
+
+                nxt = next(pending, None)
+                if nxt is not None:
+                    inflight.add(submit(*nxt))
 
     elapsed = (datetime.now() - start_time).total_seconds()
     logger.info(f"完成：生成 {generated_total} 个 PDF，总大小约 {b/1024/1024:.2f} MB，耗时 {elapsed/60:.2f} 分钟，速率 {generated_total/elapsed:.1f} 文件/秒")
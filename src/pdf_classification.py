@@ -3,28 +3,43 @@
 # Date: 2025/12/02
 # Description: PDF 分类器
 
+import io
 import os
+import re
 import csv
+import mmap
+import sqlite3
+import hashlib
 import fitz  # PyMuPDF
 import logging
-import subprocess
-from pathlib import Path
-from datetime import datetime
-from concurrent.futures import ProcessPoolExecutor, as_completed
-from threading import Thread
-from queue import Queue
+import multiprocessing
+from threading import Thread, Event
+from queue import Queue, Empty
 import time
+from functools import partial
 
 # ----------------- 配置 -----------------
 LOG_FILE_PATH = './pdf_classification.log'
 DEFAULT_CSV_FILE = './pdf_classification.csv'
+DEFAULT_FAST_CSV_FILE = './pdf_classification_fast.csv'  # --fast 的默认输出，与完整结果分开
+CSV_HEADER = ['file_path', 'page_count', 'file_size_mb', 'category']
+RESUME_DB_SUFFIX = '.idx.sqlite'  # 断点续跑索引文件后缀
+RESUME_HEAD_BYTES = 4096  # 取 CSV 开头多少字节的哈希识别文件是否被替换
 
 PAGE_COUNT_THRESHOLD = 100  # 页数阈值
 FILE_SIZE_THRESHOLD_BYTES = 10 * 1024 * 1024    # 文件大小阈值
 
 BATCH_WRITE_SIZE = 1000
+CSV_WRITE_BUFFER = 4 << 20  # CSV 写缓冲 4 MiB
+CSV_FLUSH_EVERY_BATCHES = 10  # 每写入多少批显式 flush 一次，限制崩溃时丢失的行数
 CSV_QUEUE_MAXSIZE = 5000
+SCAN_THREADS = 8  # 并行遍历顶层子目录的线程数
+SCAN_QUEUE_MAXSIZE = 10000
 PROGRESS_INTERVAL = 3
+WORKER_NICE = 10  # 工作进程降低调度优先级
+PDF_TAIL_BYTES = 1024  # 在文件末尾多少字节内查找 startxref
+IMAP_CHUNKSIZE = 16  # 每次分发给进程的任务数，小文件多时可调大
+SORT_WINDOW_SIZE = 4096  # 按大小排序的窗口，取 IMAP_CHUNKSIZE 的整数倍
 # ---------------------------------------
 
 # 配置日志
@@ -35,109 +50,402 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 预先生成的类别字符串：避免每个文件格式化新字符串，且同一批结果 pickle 时相同对象只编码一次
+_CATEGORIES = {(p, s): f"{p}-{s}" for p in ('S', 'L', '?') for s in ('S', 'L')}
+
+# 快速解析 xref 用到的正则
+_STARTXREF_RE = re.compile(rb"startxref\s+(\d+)")
+_XREF_SUBSECTION_RE = re.compile(rb"\s*(\d+)\s+(\d+)[ \t]*\r?\n")
+_XREF_ENTRY_RE = re.compile(rb"(\d{10}) (\d{5}) ([nf])")
+_ROOT_RE = re.compile(rb"/Root\s+(\d+)\s+(\d+)\s+R")
+_PAGES_RE = re.compile(rb"/Pages\s+(\d+)\s+(\d+)\s+R")
+_PREV_RE = re.compile(rb"/Prev\s+(\d+)")
+_COUNT_RE = re.compile(rb"/Count\s+(\d+)(\s+\d+\s+R)?")
+_OBJ_HEADER_RE = re.compile(rb"\s*(\d+)\s+(\d+)\s+obj")
+
 # ----------------- 工具函数 -----------------
-def find_pdf_files(root_path):
-    """生成器：查找 PDF 文件"""
-    root_path = Path(root_path)
+def _scan_pdf_entries(top, dirs_out=None):
+    """生成器：os.scandir 深度优先遍历（显式栈避免递归过深），产出 (去重键, 路径, 大小)
+
+    给定 dirs_out 时只扫描 top 本层，子目录追加到 dirs_out 而不深入
+    """
+    # 以 (st_dev, st_ino) 去重，可合并硬链接；Windows 下 inode 不可靠，仍按路径去重
+    use_inode = os.name != 'nt'
+    stack = [top]
+
+    while stack:
+        dir_path = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            (stack if dirs_out is None else dirs_out).append(entry.path)
+                        # 只对末尾 4 个字符做 lower，比整名 lower 或 glob 匹配便宜
+                        elif entry.name[-4:].lower() == '.pdf' and entry.is_file(follow_symlinks=False):
+                            # 用文件自身的 st_dev：overlayfs 等场景下文件与所在目录的设备号可能不同；
+                            # 同一次 stat 顺带拿到大小，供排序使用，且在遍历线程而非分发线程中完成
+                            st = entry.stat(follow_symlinks=False)
+                            key = (st.st_dev, st.st_ino) if use_inode else os.path.normcase(entry.path)
+                            yield key, entry.path, st.st_size
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.warning(f"无法读取目录 {dir_path}: {e}")
+
+def _scan_pdf_entries_parallel(root_path, threads):
+    """生成器：顶层子目录分给多个线程并行遍历，经有界队列汇总"""
+    subdirs = []
+    yield from _scan_pdf_entries(root_path, subdirs)
+
+    threads = min(len(subdirs), threads)
+    if threads <= 1:
+        for d in subdirs:
+            yield from _scan_pdf_entries(d)
+        return
+
+    tasks = Queue()
+    for d in subdirs:
+        tasks.put(d)
+    out = Queue(maxsize=SCAN_QUEUE_MAXSIZE)
+
+    def producer():
+        try:
+            while True:
+                try:
+                    d = tasks.get_nowait()
+                except Empty:
+                    break
+                for item in _scan_pdf_entries(d):
+                    out.put(item)
+        finally:
+            out.put(None)
+
+    for _ in range(threads):
+        Thread(target=producer, daemon=True).start()
+
+    finished = 0
+    while finished < threads:
+        item = out.get()
+        if item is None:
+            finished += 1
+            continue
+        yield item
+
+def find_pdf_entries(root_path, threads=SCAN_THREADS):
+    """生成器：查找 PDF 文件，产出 (路径, 大小)；顶层有多个子目录时多线程并行遍历"""
+    root_path = str(root_path)
+    entries = _scan_pdf_entries_parallel(root_path, threads) if threads > 1 else _scan_pdf_entries(root_path)
+
+    # 去重在单一消费端完成，遍历线程之间无需加锁
     seen = set()
+    for key, path, size in entries:
+        if key in seen:
+            continue
+        seen.add(key)
+        yield path, size
 
+def find_pdf_files(root_path, threads=SCAN_THREADS):
+    """生成器：查找 PDF 文件"""
+    for path, _ in find_pdf_entries(root_path, threads):
+        yield path
+
+# 工作进程内的共享进度计数器，由 _worker_init 设置
+_progress_counter = None
+
+def _worker_init(counter=None):
+    """工作进程初始化：一次性完成 MuPDF 全局设置，并记下共享进度计数器"""
+    global _progress_counter
+    _progress_counter = counter
+    # 损坏文件会让 MuPDF 向 stderr 刷大量错误，异常已在 process_single_pdf 中兜底
+    fitz.TOOLS.mupdf_display_errors(False)
     try:
-        cmd = ["find", str(root_path), "-type", "f", "-iname", "*.pdf"]
-        with subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True, encoding='utf-8') as proc:
-            for line in proc.stdout:
-                path = line.strip()
-                if not path:
-                    continue
-                norm = os.path.normcase(path)
-                if norm in seen:
-                    continue
-                seen.add(norm)
-                yield path
-    except Exception:
-        for pdf_path in root_path.rglob("*.[pP][dD][fF]"):
-            norm = os.path.normcase(str(pdf_path))
-            if norm in seen:
+        os.nice(WORKER_NICE)
+    except (AttributeError, OSError):
+        pass
+
+def _read_xref_section(mm, offset):
+    """解析传统 xref 表，返回 (子段列表, trailer 字节)；不是 xref 表返回 None"""
+    if mm[offset:offset + 4] != b"xref":
+        return None
+    pos = offset + 4
+    subsections = []
+    while True:
+        m = _XREF_SUBSECTION_RE.match(mm, pos)
+        if not m:
+            break
+        start, count = int(m.group(1)), int(m.group(2))
+        subsections.append((start, count, m.end()))
+        pos = m.end() + count * 20
+    trailer_pos = mm.find(b"trailer", pos, pos + 64)
+    if trailer_pos < 0:
+        return None
+    end = mm.find(b"startxref", trailer_pos)
+    trailer = mm[trailer_pos:end if end > 0 else trailer_pos + 4096]
+    return subsections, trailer
+
+def _read_object(mm, sections, num, gen):
+    """按 xref 定位对象，返回 obj ... endobj 之间的字节"""
+    for subsections in sections:
+        for start, count, entries_pos in subsections:
+            if not start <= num < start + count:
                 continue
-            seen.add(norm)
-            yield str(pdf_path)
-
-def process_single_pdf(pdf_path_str):
-    """处理单个 PDF，返回路径、页数、大小(MB)、类别"""
-    pdf_path = Path(pdf_path_str)
-    info = {
-        'file_path': str(pdf_path),
-        'page_count': 0,
-        'file_size_mb': 0.0,
-        'category': 'N/A'
-    }
+            entry_pos = entries_pos + (num - start) * 20
+            m = _XREF_ENTRY_RE.match(mm, entry_pos)
+            if not m or m.group(3) != b"n" or int(m.group(2)) != gen:
+                return None
+            offset = int(m.group(1))
+            header = _OBJ_HEADER_RE.match(mm, offset)
+            if not header or int(header.group(1)) != num or int(header.group(2)) != gen:
+                return None
+            end = mm.find(b"endobj", header.end())
+            if end < 0:
+                return None
+            return mm[header.end():end]
+    return None
+
+def _fast_page_count(pdf_path_str):
+    """mmap 读取 trailer -> Catalog -> /Pages 的 /Count；无法解析时返回 None"""
+    try:
+        fd = os.open(pdf_path_str, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+            if mm.find(b"%PDF-", 0, 1024) < 0:
+                return None
+            pos = mm.rfind(b"startxref", max(0, len(mm) - PDF_TAIL_BYTES))
+            m = _STARTXREF_RE.match(mm, pos) if pos >= 0 else None
+            if not m:
+                return None
+
+            # 沿 /Prev 链收集增量更新的 xref，新的在前
+            sections, root = [], None
+            offset, seen_offsets = int(m.group(1)), set()
+            while offset is not None and offset not in seen_offsets:
+                seen_offsets.add(offset)
+                section = _read_xref_section(mm, offset)
+                if section is None:
+                    return None
+                subsections, trailer = section
+                # 加密文件，或混合引用文件（对象可能只在 xref 流中，沿 /Prev 会查到旧版本）
+                if b"/Encrypt" in trailer or b"/XRefStm" in trailer:
+                    return None
+                sections.append(subsections)
+                if root is None:
+                    root = _ROOT_RE.search(trailer)
+                prev = _PREV_RE.search(trailer)
+                offset = int(prev.group(1)) if prev else None
+            if root is None:
+                return None
+
+            catalog = _read_object(mm, sections, int(root.group(1)), int(root.group(2)))
+            pages = _PAGES_RE.search(catalog) if catalog is not None else None
+            if not pages:
+                return None
+            pages_obj = _read_object(mm, sections, int(pages.group(1)), int(pages.group(2)))
+            count = _COUNT_RE.search(pages_obj) if pages_obj is not None else None
+            if not count or count.group(2):
+                return None
+            return int(count.group(1))
+    except (ValueError, OSError):
+        return None
+    finally:
+        os.close(fd)
+
+def process_single_pdf(pdf_path_str, size_only=False):
+    """处理单个 PDF，返回 (路径, 页数, 大小(MB), 类别) 元组，顺序与 CSV_HEADER 一致
+
+    返回元组而非 dict，跨进程 pickle 更小更快；
+    size_only=True 时不解析 PDF，page_count 记为 -1，页数类别记为 '?'
+    """
+    page_count = 0
+    file_size_mb = 0.0
+    category = 'N/A'
 
     try:
-        file_size_bytes = pdf_path.stat().st_size
-        file_size_mb = file_size_bytes / (1024 * 1024)
-        info['file_size_mb'] = round(file_size_mb, 2)
+        file_size_bytes = os.stat(pdf_path_str).st_size
+        file_size_mb = round(file_size_bytes / (1024 * 1024), 2)
 
-        with fitz.open(str(pdf_path)) as doc:
-            info['page_count'] = doc.page_count
+        size_cat = 'L' if file_size_bytes > FILE_SIZE_THRESHOLD_BYTES else 'S'
+        if size_only:
+            return pdf_path_str, -1, file_size_mb, _CATEGORIES['?', size_cat]
 
-            page_cat = 'L' if info['page_count'] > PAGE_COUNT_THRESHOLD else 'S'
-            size_cat = 'L' if file_size_bytes > FILE_SIZE_THRESHOLD_BYTES else 'S'
-            info['category'] = f"{page_cat}-{size_cat}"
+        # 优先直接读 xref；xref 流、加密或损坏文件回退到 MuPDF
+        count = _fast_page_count(pdf_path_str)
+        if count is None:
+            # 指定 filetype 跳过格式探测；只读 page_count，不解析页面对象
+            with fitz.open(pdf_path_str, filetype="pdf") as doc:
+                count = doc.page_count
+        page_count = count
+
+        page_cat = 'L' if page_count > PAGE_COUNT_THRESHOLD else 'S'
+        category = _CATEGORIES[page_cat, size_cat]
 
     except Exception:
         pass
-
-    return info
-
-def load_processed_csv(csv_file):
-    """加载已处理记录"""
-    processed = set()
+    finally:
+        if _progress_counter is not None:
+            with _progress_counter.get_lock():
+                _progress_counter.value += 1
+
+    return pdf_path_str, page_count, file_size_mb, category
+
+def _hash64(data):
+    """稳定的有符号 64 位哈希（内置 hash 每个进程随机化，不能落盘）"""
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big', signed=True)
+
+def _path_key(path):
+    return _hash64(os.path.normcase(path).encode('utf-8', 'surrogateescape'))
+
+def _csv_identity(csv_file, head_len):
+    """CSV 的身份：(st_dev, st_ino, 开头 head_len 字节的哈希)；只追加写入时保持不变"""
+    st = os.stat(csv_file)
+    with open(csv_file, 'rb') as f:
+        head = f.read(head_len)
+    return {'csv_dev': st.st_dev, 'csv_ino': st.st_ino, 'csv_head_len': head_len, 'csv_head_hash': _hash64(head)}
+
+def _open_resume_db(csv_file):
+    """打开已处理记录索引（sqlite），并把 CSV 中尚未索引的新行补进来"""
+    # 查询在 Pool 的任务分发线程中进行，需关闭同线程检查
+    db = sqlite3.connect(csv_file + RESUME_DB_SUFFIX, check_same_thread=False)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.execute("CREATE TABLE IF NOT EXISTS done(h INTEGER PRIMARY KEY)")
+    db.execute("CREATE TABLE IF NOT EXISTS meta(k TEXT PRIMARY KEY, v INTEGER)")
+
+    meta = dict(db.execute("SELECT k, v FROM meta"))
     if not os.path.exists(csv_file):
-        return processed
+        # CSV 已删除（重新开始），旧索引作废
+        with db:
+            db.execute("DELETE FROM done")
+            db.execute("DELETE FROM meta")
+        return db
+
+    offset = meta.get('csv_offset', 0)
+    identity = _csv_identity(csv_file, meta.get('csv_head_len', 0))
+    if offset > os.path.getsize(csv_file) or any(meta.get(k) != v for k, v in identity.items()):
+        # CSV 被截断或替换，重建索引
+        with db:
+            db.execute("DELETE FROM done")
+            db.execute("DELETE FROM meta")
+        offset = 0
+
     try:
-        with open(csv_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                p = row.get("file_path")
-                if p:
-                    processed.add(os.path.normcase(p))
-        logger.info(f"已加载 {len(processed)} 条已处理记录")
+        added = 0
+        with open(csv_file, 'rb') as raw:
+            raw.seek(offset)
+            f = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+            reader = csv.DictReader(f, fieldnames=None if offset == 0 else CSV_HEADER)
+            with db:
+                for row in reader:
+                    p = row.get("file_path")
+                    # --fast 写出的行（page_count=-1）不算已处理，完整运行时会重新分类
+                    if p and not (row.get("page_count") or '').startswith('-'):
+                        db.execute("INSERT OR IGNORE INTO done(h) VALUES (?)", (_path_key(p),))
+                        added += 1
+                end = raw.tell()
+                meta = _csv_identity(csv_file, min(end, RESUME_HEAD_BYTES))
+                meta['csv_offset'] = end
+                db.executemany("INSERT OR REPLACE INTO meta(k, v) VALUES (?, ?)", meta.items())
+        logger.info(f"已索引 {added} 条新的已处理记录")
     except Exception as e:
         logger.warning(f"加载 CSV 失败: {e}")
-    return processed
+    return db
+
+def _is_processed(db, path):
+    return db.execute("SELECT 1 FROM done WHERE h=?", (_path_key(path),)).fetchone() is not None
+
+def _format_csv_rows(rows):
+    """把一批结果元组拼成 CSV 文本，整批一次 write
+
+    只有路径可能含逗号/引号/换行，统一加引号转义；其余字段为数字或固定类别，
+    行尾与 csv.writer 默认的 \r\n 保持一致
+    """
+    return ''.join(
+        '"%s",%s,%s,%s\r\n' % (path.replace('"', '""'), page_count, file_size_mb, category)
+        for path, page_count, file_size_mb, category in rows
+    )
+
+def _size_sorted(entries, window=SORT_WINDOW_SIZE, chunksize=IMAP_CHUNKSIZE):
+    """生成器：输入 (路径, 大小)，每 window 个按大小降序后交错分配到各 chunk 再输出路径
+
+    imap_unordered 把连续 chunksize 个任务打成一个 chunk 交给同一进程，
+    直接按降序输出会让最大的文件挤在同一 chunk 里串行处理；
+    交错后第 k 个 chunk 依次拿到第 k、k+m、k+2m... 大的文件（m 为 chunk 数），
+    每个 chunk 都以一个大文件开头，总量也大致均衡
+    """
+    def flush(buf):
+        buf.sort(key=lambda item: item[1], reverse=True)
+        m = -(-len(buf) // chunksize)
+        for k in range(m):
+            for i in range(k, len(buf), m):
+                yield buf[i][0]
+
+    buf = []
+    for item in entries:
+        buf.append(item)
+        if len(buf) >= window:
+            yield from flush(buf)
+            buf = []
+    yield from flush(buf)
 
 # ----------------- 核心处理函数 -----------------
-def process_pdfs(root_path, csv_file=DEFAULT_CSV_FILE, workers=None, resume=True):
+def process_pdfs(root_path, csv_file=DEFAULT_CSV_FILE, workers=None, resume=True, size_only=False):
     """主处理函数：多进程 + 写线程 + 实时进度"""
     # CSV 写线程嵌套
     def csv_writer_thread(csv_file, queue: Queue):
         file_exists = os.path.exists(csv_file)
-        with open(csv_file, 'a', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
+        with open(csv_file, 'a', newline='', encoding='utf-8', buffering=CSV_WRITE_BUFFER) as f:
             if not file_exists:
-                writer.writerow(['file_path', 'page_count', 'file_size_mb', 'category'])
+                csv.writer(f).writerow(CSV_HEADER)
 
+            batches = 0
             while True:
                 rows = queue.get()
                 if rows is None:
                     break
-                for row in rows:
-                    if row is None:
-                        continue
-                    writer.writerow([
-                        row['file_path'],
-                        row['page_count'],
-                        row['file_size_mb'],
-                        row['category']
-                    ])
+                f.write(_format_csv_rows(rows))
+                batches += 1
+                if batches % CSV_FLUSH_EVERY_BATCHES == 0:
+                    f.flush()
                 queue.task_done()
 
+            # 结束时落盘，保证下次续跑索引读到完整 CSV
+            f.flush()
+            os.fsync(f.fileno())
+
+    # 进度线程：定期读取 worker 累加的共享计数器，不占用结果消费循环
+    def progress_thread(counter, stop: Event, start):
+        last_time = start
+        last_count = 0
+        while not stop.wait(PROGRESS_INTERVAL):
+            now = time.monotonic()
+            processed = counter.value
+            # 平均速率
+            elapsed_total = now - start
+            avg_speed = processed / elapsed_total if elapsed_total > 0 else 0
+            # 瞬时速率
+            interval_speed = (processed - last_count) / (now - last_time)
+
+            logger.info(
+                f"已处理 {processed} 个文件，"
+                f"平均速率 {avg_speed:.1f} 文件/秒，"
+                f"瞬时速率 {interval_speed:.1f} 文件/秒"
+            )
+
+            last_count = processed
+            last_time = now
+
     workers = workers or (os.cpu_count() or 4)
-    processed = load_processed_csv(csv_file) if resume else set()
+    # 只按大小分类的结果不进入续跑索引，也不据此跳过文件
+    resume = resume and not size_only
+    resume_db = _open_resume_db(csv_file) if resume else None
 
     stats = {
         "processed": 0,
         "category_counts": {'S-S':0, 'S-L':0, 'L-S':0, 'L-L':0, 'N/A':0},
-        "start": datetime.now()
+        "start": time.monotonic()
     }
 
     csv_queue = Queue(maxsize=CSV_QUEUE_MAXSIZE)
@@ -145,49 +453,47 @@ def process_pdfs(root_path, csv_file=DEFAULT_CSV_FILE, workers=None, resume=True
     writer_thread.start()
 
     batch_rows = []
-    pdf_gen = (p for p in find_pdf_files(root_path) if os.path.normcase(p) not in processed)
-
-    with ProcessPoolExecutor(max_workers=workers) as executor:
-        futures = {executor.submit(process_single_pdf, p): p for p in pdf_gen}
-
-        last_time = time.time()
-        last_count = 0
-
-        for fut in as_completed(futures):
-            res = fut.result()
+    entries = find_pdf_entries(root_path)
+    if resume_db is not None:
+        entries = ((p, size) for p, size in entries if not _is_processed(resume_db, p))
+    # 只按大小分类时每个任务开销相同，排序没有意义
+    pdf_gen = (p for p, _ in entries) if size_only else _size_sorted(entries)
+
+    # imap_unordered 按 chunksize 批量分发，摊薄每个任务的 pickle/IPC 开销；
+    # 任务管道写满时分发线程会阻塞，生成器不会被一次性耗尽
+    # forkserver 从干净的服务进程 fork，不继承主进程堆；预加载 fitz 使每个 worker 无需重复导入
+    ctx = multiprocessing.get_context("forkserver")
+    ctx.set_forkserver_preload(["__main__", "fitz"])
+    counter = ctx.Value('q', 0)
+    stop_progress = Event()
+    progress = Thread(target=progress_thread, args=(counter, stop_progress, stats["start"]), daemon=True)
+    progress.start()
+
+    with ctx.Pool(processes=workers, initializer=_worker_init, initargs=(counter,)) as pool:
+        task = partial(process_single_pdf, size_only=True) if size_only else process_single_pdf
+        for res in pool.imap_unordered(task, pdf_gen, chunksize=IMAP_CHUNKSIZE):
             batch_rows.append(res)
             stats["processed"] += 1
-            stats["category_counts"].setdefault(res['category'], 0)
-            stats["category_counts"][res['category']] += 1
+            category = res[3]
+            stats["category_counts"].setdefault(category, 0)
+            stats["category_counts"][category] += 1
 
             if len(batch_rows) >= BATCH_WRITE_SIZE:
-                csv_queue.put(batch_rows.copy())
-                batch_rows.clear()
-
-            now = time.time()
-            if now - last_time >= PROGRESS_INTERVAL:
-                # 平均速率
-                elapsed_total = (now - stats["start"].timestamp())
-                avg_speed = stats["processed"] / elapsed_total if elapsed_total > 0 else 0
-                # 瞬时速率
-                interval_count = stats["processed"] - last_count
-                interval_speed = interval_count / (now - last_time)
-
-                logger.info(
-                    f"已处理 {stats['processed']} 个文件，"
-                    f"平均速率 {avg_speed:.1f} 文件/秒，"
-                    f"瞬时速率 {interval_speed:.1f} 文件/秒"
-                )
-
-                last_count = stats["processed"]
-                last_time = now
+                # 直接交出列表并重新绑定，避免每批复制
+                csv_queue.put(batch_rows)
+                batch_rows = []
+
+    stop_progress.set()
+    progress.join()
 
     if batch_rows:
-        csv_queue.put(batch_rows.copy())
+        csv_queue.put(batch_rows)
     csv_queue.put(None)
     writer_thread.join()
+    if resume_db is not None:
+        resume_db.close()
 
-    total_time = (datetime.now() - stats["start"]).total_seconds()
+    total_time = time.monotonic() - stats["start"]
     logger.info("="*50)
     logger.info(f"处理完成！总文件数: {stats['processed']}")
     logger.info(f"总用时: {total_time/60:.1f} 分钟")
@@ -202,12 +508,18 @@ def main():
     import argparse
     parser = argparse.ArgumentParser(description="PDF 分类器")
     parser.add_argument("root_path", help="PDF 根目录")
-    parser.add_argument("--output", "-o", default=DEFAULT_CSV_FILE)
+    parser.add_argument("--output", "-o",
+                        help=f"输出 CSV，默认 {DEFAULT_CSV_FILE}（--fast 时为 {DEFAULT_FAST_CSV_FILE}）")
     parser.add_argument("--workers", "-w", type=int, help="进程数")
     parser.add_argument("--no-resume", action="store_true", help="不加载已有 CSV")
+    parser.add_argument("--fast", action="store_true",
+                        help="只按文件大小分类，不读取页数（page_count 记为 -1）；不做断点续跑，"
+                             "这些行也不会让之后的完整运行跳过对应文件")
     args = parser.parse_args()
 
-    process_pdfs(args.root_path, csv_file=args.output, workers=args.workers, resume=not args.no_resume)
+    csv_file = args.output or (DEFAULT_FAST_CSV_FILE if args.fast else DEFAULT_CSV_FILE)
+    process_pdfs(args.root_path, csv_file=csv_file, workers=args.workers,
+                 resume=not args.no_resume, size_only=args.fast)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+
+import os
+import pytest
+
+
+@pytest.fixture(scope="session")
+def pc(tmp_path_factory):
+    """导入 pdf_classification；模块导入时会在当前目录创建日志文件，切到临时目录导入"""
+    pytest.importorskip("fitz")
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("log"))
+    try:
+        import pdf_classification
+    finally:
+        os.chdir(cwd)
+    return pdf_classification
+
+
+@pytest.fixture
+def write_csv(pc):
+    """按 csv_writer_thread 的方式追加一批结果行（新文件先写表头）"""
+    import csv
+
+    def write(csv_file, rows):
+        file_exists = os.path.exists(csv_file)
+        with open(csv_file, 'a', newline='', encoding='utf-8') as f:
+            if not file_exists:
+                csv.writer(f).writerow(pc.CSV_HEADER)
+            f.write(pc._format_csv_rows(rows))
+    return write
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+# Description: 手写 CSV 行格式与 csv.reader / 续跑索引的往返测试
+
+import csv
+
+PATHS = [
+    "/data/plain.pdf",
+    "/data/a,b.pdf",
+    '/data/say "hi".pdf',
+    '/data/"quoted",,"x".pdf',
+    "/data/line\nbreak.pdf",
+    "/data/crlf\r\nname.pdf",
+    "/数据/中文 文件.pdf",
+]
+
+
+def test_rows_round_trip_through_csv_reader(pc, write_csv, tmp_path):
+    csv_file = str(tmp_path / "out.csv")
+    rows = [(p, i, 0.25, "S-S") for i, p in enumerate(PATHS)]
+    write_csv(csv_file, rows)
+
+    with open(csv_file, newline='', encoding='utf-8') as f:
+        read = list(csv.reader(f))
+    assert read[0] == pc.CSV_HEADER
+    assert read[1:] == [[p, str(i), "0.25", "S-S"] for i, p in enumerate(PATHS)]
+
+
+def test_rows_round_trip_through_resume_index(pc, write_csv, tmp_path):
+    csv_file = str(tmp_path / "out.csv")
+    write_csv(csv_file, [(p, 1, 0.0, "S-S") for p in PATHS])
+
+    db = pc._open_resume_db(csv_file)
+    try:
+        assert all(pc._is_processed(db, p) for p in PATHS)
+        assert not pc._is_processed(db, "/data/a.pdf")
+    finally:
+        db.close()
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+# Description: _fast_page_count 与 MuPDF 结果一致性测试
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+
+def make_pdf(path, pages, **save_kwargs):
+    doc = fitz.open()
+    for _ in range(pages):
+        doc.new_page()
+    doc.save(str(path), **save_kwargs)
+    doc.close()
+    return str(path)
+
+
+def mupdf_page_count(path):
+    with fitz.open(path) as doc:
+        return doc.page_count
+
+
+def test_classic_xref(pc, tmp_path):
+    p = make_pdf(tmp_path / "classic.pdf", 120)
+    assert pc._fast_page_count(p) == mupdf_page_count(p) == 120
+
+
+def test_incremental_update(pc, tmp_path):
+    p = make_pdf(tmp_path / "incr.pdf", 30)
+    with fitz.open(p) as doc:
+        doc.delete_pages(range(0, 5))
+        doc.saveIncr()
+    with fitz.open(p) as doc:
+        doc.new_page()
+        doc.saveIncr()
+    assert pc._fast_page_count(p) == mupdf_page_count(p) == 26
+
+
+def test_object_streams_return_none(pc, tmp_path):
+    # xref 流不在快速路径支持范围内，必须交给 MuPDF
+    p = make_pdf(tmp_path / "objstm.pdf", 7, use_objstms=1)
+    assert pc._fast_page_count(p) is None
+
+
+def test_encrypted_returns_none(pc, tmp_path):
+    p = make_pdf(tmp_path / "encrypted.pdf", 3,
+                 encryption=fitz.PDF_ENCRYPT_AES_256, user_pw="u", owner_pw="o")
+    assert pc._fast_page_count(p) is None
+
+
+def test_hybrid_xrefstm_returns_none(pc, tmp_path):
+    # 在传统 xref 之后追加带 /XRefStm 的增量段，模拟混合引用文件
+    p = make_pdf(tmp_path / "hybrid.pdf", 4)
+    with fitz.open(p) as doc:
+        root = doc.pdf_catalog()
+        size = doc.xref_length()
+    with open(p, "rb") as f:
+        data = f.read()
+    prev = int(data[data.rindex(b"startxref") + 9:].split()[0])
+    pos = len(data)
+    tail = (b"xref\n0 0\ntrailer\n<< /Size %d /Root %d 0 R /Prev %d /XRefStm %d >>\n"
+            b"startxref\n%d\n%%%%EOF\n" % (size, root, prev, prev, pos))
+    with open(p, "ab") as f:
+        f.write(tail)
+    assert pc._fast_page_count(p) is None
+
+
+@pytest.mark.parametrize("content", [b"", b"junk, not a pdf\n", b"%PDF-1.7\nstartxref\n999999\n%%EOF\n"])
+def test_empty_or_junk_returns_none(pc, tmp_path, content):
+    p = tmp_path / "bad.pdf"
+    p.write_bytes(content)
+    assert pc._fast_page_count(str(p)) is None
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# Description: 续跑索引（sqlite）与 CSV 同步测试
+
+import csv
+import os
+import pytest
+
+
+def rows(*paths):
+    return [(p, 1, 0.0, "S-S") for p in paths]
+
+
+def processed(pc, db, paths):
+    return {p for p in paths if pc._is_processed(db, p)}
+
+
+def test_append_indexes_only_new_rows(pc, write_csv, tmp_path):
+    csv_file = str(tmp_path / "out.csv")
+    write_csv(csv_file, rows("/a.pdf", "/b.pdf"))
+    db = pc._open_resume_db(csv_file)
+    # 从索引中删掉一行：若重新从头读取 CSV，它会被补回来
+    with db:
+        db.execute("DELETE FROM done WHERE h=?", (pc._path_key("/a.pdf"),))
+    db.close()
+
+    write_csv(csv_file, rows("/c.pdf"))
+    db = pc._open_resume_db(csv_file)
+    try:
+        assert processed(pc, db, ["/a.pdf", "/b.pdf", "/c.pdf"]) == {"/b.pdf", "/c.pdf"}
+        offset = db.execute("SELECT v FROM meta WHERE k='csv_offset'").fetchone()[0]
+        assert offset == os.path.getsize(csv_file)
+    finally:
+        db.close()
+
+
+def test_deleted_csv_clears_index(pc, write_csv, tmp_path):
+    csv_file = str(tmp_path / "out.csv")
+    write_csv(csv_file, rows("/a.pdf", "/b.pdf"))
+    pc._open_resume_db(csv_file).close()
+
+    os.remove(csv_file)
+    db = pc._open_resume_db(csv_file)
+    try:
+        assert processed(pc, db, ["/a.pdf", "/b.pdf"]) == set()
+        assert db.execute("SELECT COUNT(*) FROM meta").fetchone()[0] == 0
+    finally:
+        db.close()
+
+
+@pytest.mark.parametrize("in_place", [False, True])
+def test_replaced_csv_rebuilds_index(pc, write_csv, tmp_path, in_place):
+    csv_file = str(tmp_path / "out.csv")
+    write_csv(csv_file, rows("/old1.pdf", "/old2.pdf"))
+    pc._open_resume_db(csv_file).close()
+
+    # 新 CSV 比旧的已索引偏移更长，内容完全不同
+    new_rows = rows(*(f"/new{i}.pdf" for i in range(20)))
+    if in_place:
+        # 原地重写，inode 不变，只能靠开头内容的哈希识别
+        ino = os.stat(csv_file).st_ino
+        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerow(pc.CSV_HEADER)
+            f.write(pc._format_csv_rows(new_rows))
+        assert os.stat(csv_file).st_ino == ino
+    else:
+        tmp_file = str(tmp_path / "new.csv")
+        write_csv(tmp_file, new_rows)
+        os.replace(tmp_file, csv_file)
+
+    db = pc._open_resume_db(csv_file)
+    try:
+        new_paths = [r[0] for r in new_rows]
+        assert processed(pc, db, new_paths) == set(new_paths)
+        assert processed(pc, db, ["/old1.pdf", "/old2.pdf"]) == set()
+    finally:
+        db.close()
+
+
+def test_truncated_csv_rebuilds_index(pc, write_csv, tmp_path):
+    csv_file = str(tmp_path / "out.csv")
+    write_csv(csv_file, rows("/a.pdf"))
+    size_a = os.path.getsize(csv_file)
+    write_csv(csv_file, rows("/b.pdf", "/c.pdf"))
+    pc._open_resume_db(csv_file).close()
+
+    os.truncate(csv_file, size_a)
+    db = pc._open_resume_db(csv_file)
+    try:
+        assert processed(pc, db, ["/a.pdf", "/b.pdf", "/c.pdf"]) == {"/a.pdf"}
+    finally:
+        db.close()
+
+
+def test_no_resume_rows_are_indexed_on_next_resume(pc, write_csv, tmp_path):
+    csv_file = str(tmp_path / "out.csv")
+    write_csv(csv_file, rows("/a.pdf"))
+    pc._open_resume_db(csv_file).close()
+
+    # --no-resume 运行只追加 CSV，不打开索引
+    write_csv(csv_file, rows("/b.pdf"))
+    db = pc._open_resume_db(csv_file)
+    try:
+        assert processed(pc, db, ["/a.pdf", "/b.pdf"]) == {"/a.pdf", "/b.pdf"}
+    finally:
+        db.close()
+
+
+def test_size_only_rows_are_not_indexed(pc, write_csv, tmp_path):
+    csv_file = str(tmp_path / "out.csv")
+    write_csv(csv_file, [("/fast.pdf", -1, 0.5, "?-S"), ("/full.pdf", 120, 0.5, "L-S")])
+    db = pc._open_resume_db(csv_file)
+    try:
+        assert processed(pc, db, ["/fast.pdf", "/full.pdf"]) == {"/full.pdf"}
+        assert db.execute("SELECT COUNT(*) FROM done").fetchone()[0] == 1
+    finally:
+        db.close()